@@ -12,6 +12,13 @@ OUTPUT_DIR = os.path.join(BASE_DIR, "dataset")
 SITE1_URL = "https://www.exemplo-site-plantas.com"
 SITE1_DISEASE_LIST_URL = "https://www.exemplo-site-plantas.com/doencas-plantas"
 
+# Headers HTTP padrão dos scrapers e do reparo do dataset (simulam um navegador)
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
+}
+
 # Configurações de delay entre requisições (em segundos)
 MIN_DELAY = 1.0
 MAX_DELAY = 3.0
@@ -1,22 +1,73 @@
 # main.py
 import os
-from scrapers.scraper_site1 import PlantDiseaseScraper
+import argparse
 import config
 
-def main():
+def scrape():
+    from scrapers.scraper_site1 import PlantDiseaseScraper
+
     # Inicializar e executar o scraper
     scraper = PlantDiseaseScraper(
         base_url=config.SITE1_URL,
         output_dir=config.OUTPUT_DIR
     )
-    
+
     # Iniciar o scraping da página de lista de doenças
     scraper.scrape_disease_list(config.SITE1_DISEASE_LIST_URL)
-    
-    # Salvar metadados
+
+    # Salvar metadados e manifesto de integridade
     scraper.save_metadata()
-    
+    scraper.save_manifest()
+
     print("Scraping concluído! Dataset criado em:", config.OUTPUT_DIR)
 
+def verify(repair=False, workers=None, use_processes=False):
+    from utils.manifest import load_manifest, verify_manifest, print_report, repair_manifest
+
+    try:
+        manifest = load_manifest(config.OUTPUT_DIR)
+    except FileNotFoundError:
+        print(f"Manifesto não encontrado em {config.OUTPUT_DIR}; execute o scraping primeiro")
+        return False
+    except ValueError as e:
+        print(f"Manifesto inválido em {config.OUTPUT_DIR}: {e}")
+        return False
+
+    print(f"Verificando {len(manifest['assets'])} arquivos em {config.OUTPUT_DIR}")
+    report = verify_manifest(config.OUTPUT_DIR, manifest, workers=workers, use_processes=use_processes)
+    print_report(report)
+
+    broken = report['missing'] or report['corrupt'] or report['suspect']
+
+    if repair and broken:
+        repaired, failed = repair_manifest(
+            config.OUTPUT_DIR, report, manifest, headers=config.HEADERS,
+            min_delay=config.MIN_DELAY, max_delay=config.MAX_DELAY
+        )
+        print(f"Reparo concluído: {len(repaired)} arquivos baixados novamente, {len(failed)} não reparados")
+        return not failed
+
+    return not broken
+
+def main():
+    parser = argparse.ArgumentParser(description="Criação e verificação do dataset de doenças de plantas")
+    subparsers = parser.add_subparsers(dest="command")
+
+    verify_parser = subparsers.add_parser("verify", help="Verifica o dataset contra o manifesto")
+    verify_parser.add_argument("--repair", action="store_true",
+                               help="Baixa novamente os arquivos ausentes ou corrompidos")
+    verify_parser.add_argument("--workers", type=int, default=None,
+                               help="Número de threads/processos usados na verificação")
+    verify_parser.add_argument("--processes", action="store_true",
+                               help="Usa um pool de processos em vez de threads")
+
+    args = parser.parse_args()
+
+    if args.command == "verify":
+        ok = verify(repair=args.repair, workers=args.workers, use_processes=args.processes)
+        raise SystemExit(0 if ok else 1)
+
+    scrape()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -6,6 +6,9 @@ import time
 import random
 import pandas as pd
 from urllib.parse import urljoin
+import config
+from utils.helpers import download_file
+from utils.manifest import update_manifest
 
 class PlantDiseaseScraper:
     def __init__(self, base_url, output_dir):
@@ -26,14 +29,19 @@ class PlantDiseaseScraper:
         os.makedirs(self.description_dir, exist_ok=True)
         
         # Headers para simular um navegador (evitar bloqueios)
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
-        }
+        self.headers = dict(config.HEADERS)
         
         # Para armazenar os metadados
         self.metadata = []
+        
+        # URL de origem de cada arquivo baixado (usada no manifesto para reparos)
+        self.asset_sources = {}
+        
+        # Tamanho e sha256 calculados durante o download, reaproveitados no manifesto
+        self.asset_digests = {}
+        
+        # Downloads que falharam, registrados no manifesto como ausentes
+        self.failed_downloads = []
     
     def get_page(self, url):
         """Obtém o conteúdo HTML da página"""
@@ -47,6 +55,7 @@ class PlantDiseaseScraper:
     
     def download_image(self, img_url, disease_name):
         """Baixa e salva uma imagem"""
+        filename = None
         try:
             # Criar nome de arquivo seguro
             safe_name = ''.join(c if c.isalnum() else '_' for c in disease_name)
@@ -57,16 +66,15 @@ class PlantDiseaseScraper:
             
             # Baixar a imagem
             img_url = urljoin(self.base_url, img_url)  # Converte URL relativa para absoluta
-            response = requests.get(img_url, headers=self.headers, stream=True)
-            response.raise_for_status()
-            
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(1024):
-                    f.write(chunk)
+            self.asset_sources[filename] = img_url
+            self.asset_digests[filename] = download_file(img_url, filepath, headers=self.headers)
             
             return filename
         except Exception as e:
             print(f"Erro ao baixar imagem {img_url}: {e}")
+            if filename:
+                self.failed_downloads.append({'kind': 'image', 'path': f"images/{filename}",
+                                              'url': self.asset_sources.get(filename)})
             return None
     
     def save_description(self, description, disease_name):
@@ -111,6 +119,7 @@ class PlantDiseaseScraper:
                 image_urls.append(img_url)
         
         # Baixar imagens
+        failed_start = len(self.failed_downloads)
         downloaded_images = []
         for i, img_url in enumerate(image_urls):
             img_filename = self.download_image(img_url, f"{disease_name}_{i}")
@@ -127,6 +136,10 @@ class PlantDiseaseScraper:
             'image_files': downloaded_images,
             'image_count': len(downloaded_images)
         })
+        
+        # Associar os downloads que falharam a este registro
+        for asset in self.failed_downloads[failed_start:]:
+            asset.update(record=disease_name, record_url=url)
     
     def scrape_disease_list(self, list_url):
         """Extrai a lista de doenças de uma página índice"""
@@ -161,4 +174,26 @@ class PlantDiseaseScraper:
         df = pd.DataFrame(self.metadata)
         csv_path = os.path.join(self.output_dir, "metadata.csv")
         df.to_csv(csv_path, index=False)
-        print(f"Metadados salvos em {csv_path}")
\ No newline at end of file
+        print(f"Metadados salvos em {csv_path}")
+    
+    def save_manifest(self):
+        """Salva o manifesto de integridade com todos os arquivos do dataset"""
+        if not self.metadata:
+            return
+        
+        assets = []
+        for item in self.metadata:
+            record = {'record': item['disease_name'], 'record_url': item['url']}
+            for img_filename in item['image_files']:
+                size, sha256 = self.asset_digests.get(img_filename, (None, None))
+                assets.append(dict(record, kind='image', path=f"images/{img_filename}",
+                                   url=self.asset_sources.get(img_filename),
+                                   size=size, sha256=sha256))
+            if item['description_file']:
+                assets.append(dict(record, kind='description',
+                                   path=f"descriptions/{item['description_file']}", url=None))
+        assets.extend(self.failed_downloads)
+        
+        manifest_path = update_manifest(self.output_dir, assets,
+                                        owned_dirs=['images', 'descriptions'])
+        print(f"Manifesto salvo em {manifest_path}")
@@ -0,0 +1,42 @@
+# tests/test_helpers.py
+import os
+import hashlib
+from unittest import mock
+
+import pytest
+
+from utils.helpers import download_file
+
+
+def fake_response(body, headers):
+    response = mock.MagicMock()
+    response.__enter__.return_value = response
+    response.headers = headers
+    response.iter_content.return_value = [body[i:i + 3] for i in range(0, len(body), 3)]
+    return response
+
+
+def test_download_file_saves_complete_file(tmp_path):
+    filepath = str(tmp_path / "imagem.jpg")
+    body = b"conteudo da imagem"
+    response = fake_response(body, {'Content-Length': str(len(body))})
+
+    with mock.patch('utils.helpers.requests.get', return_value=response):
+        size, sha256 = download_file("https://exemplo/imagem.jpg", filepath)
+
+    assert (size, sha256) == (len(body), hashlib.sha256(body).hexdigest())
+    with open(filepath, 'rb') as f:
+        assert f.read() == body
+    assert not os.path.exists(filepath + ".part")
+
+
+def test_download_file_discards_short_download(tmp_path):
+    filepath = str(tmp_path / "artigo.pdf")
+    response = fake_response(b"%PDF-1.4 trunc", {'Content-Length': "4096"})
+
+    with mock.patch('utils.helpers.requests.get', return_value=response):
+        with pytest.raises(IOError):
+            download_file("https://exemplo/artigo.pdf", filepath)
+
+    assert not os.path.exists(filepath)
+    assert not os.path.exists(filepath + ".part")
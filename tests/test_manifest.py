@@ -0,0 +1,223 @@
+# tests/test_manifest.py
+import os
+import hashlib
+from unittest import mock
+
+import pytest
+
+from utils.manifest import (
+    MANIFEST_FILENAME, build_manifest, hash_file, save_manifest, load_manifest, verify_manifest,
+    repair_manifest, update_manifest,
+)
+
+JPEG = b'\xff\xd8' + b'\x00' * 4096 + b'\xff\xd9'
+PDF = b'%PDF-1.4\n' + b'\x00' * 4096 + b'\n%%EOF\n'
+
+
+def write(root, rel_path, data):
+    path = os.path.join(root, *rel_path.split('/'))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+def asset(rel_path, kind='image', url=None):
+    return {'path': rel_path, 'kind': kind, 'record': 'Ferrugem',
+            'record_url': 'https://exemplo/ferrugem', 'url': url}
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    """Dataset com manifesto salvo e depois danificado"""
+    root = str(tmp_path)
+    write(root, 'images/ok.jpg', JPEG)
+    truncated = write(root, 'images/truncated.jpg', JPEG)
+    deleted = write(root, 'pdfs/deleted.pdf', PDF)
+    write(root, 'descriptions/ferrugem.txt', b'descricao')
+
+    manifest = build_manifest(root, [
+        asset('images/ok.jpg'),
+        asset('images/truncated.jpg', url='https://exemplo/truncated.jpg'),
+        asset('pdfs/deleted.pdf', kind='pdf', url='https://exemplo/deleted.pdf'),
+        asset('descriptions/ferrugem.txt', kind='description'),
+        asset('images/never_downloaded.jpg', url='https://exemplo/never.jpg'),
+    ])
+    save_manifest(manifest, root)
+
+    with open(truncated, 'r+b') as f:
+        f.truncate(100)
+    os.remove(deleted)
+    write(root, 'descriptions/ferrugem_1700000000000.txt', b'antiga')
+    return root
+
+
+def summarize(report):
+    return {
+        'ok': sorted(entry['path'] for entry in report['ok']),
+        'missing': sorted(entry['path'] for entry in report['missing']),
+        'corrupt': sorted(entry['path'] for entry, _ in report['corrupt']),
+        'orphaned': report['orphaned'],
+    }
+
+
+def test_verify_reports_missing_corrupt_and_orphaned(dataset):
+    summary = summarize(verify_manifest(dataset))
+
+    assert summary == {
+        'ok': ['descriptions/ferrugem.txt', 'images/ok.jpg'],
+        'missing': ['images/never_downloaded.jpg', 'pdfs/deleted.pdf'],
+        'corrupt': ['images/truncated.jpg'],
+        'orphaned': ['descriptions/ferrugem_1700000000000.txt'],
+    }
+
+
+def test_missing_asset_is_kept_in_manifest(dataset):
+    manifest = build_manifest(dataset, [asset('images/gone.jpg', url='https://exemplo/gone.jpg')])
+
+    entry, = manifest['assets']
+    assert entry['url'] == 'https://exemplo/gone.jpg'
+    assert entry['size'] is None and entry['sha256'] is None
+
+
+def test_thread_and_process_pools_agree(dataset):
+    threads = verify_manifest(dataset, workers=4)
+    processes = verify_manifest(dataset, workers=2, use_processes=True)
+
+    assert summarize(threads) == summarize(processes)
+
+
+def test_recorded_format_problem_is_suspect(tmp_path):
+    root = str(tmp_path)
+    # JPEG truncado antes da criação do manifesto (ex.: imagem data: gravada direto)
+    write(root, 'images/cortada.jpg', JPEG[:2048])
+    save_manifest(build_manifest(root, [asset('images/cortada.jpg')]), root)
+
+    report = verify_manifest(root)
+
+    assert not report['ok'] and not report['corrupt']
+    entry, detail = report['suspect'][0]
+    assert entry['path'] == 'images/cortada.jpg'
+    assert 'JPEG' in detail
+
+
+@pytest.mark.parametrize('content', [
+    '[]',
+    '{"version": 1}',
+    '{"version": 1, "assets": {}}',
+    '{"version": 1, "assets": [{"path": "images/a.jpg"}]}',
+    '{"version": 2, "assets": []}',
+])
+def test_load_manifest_rejects_invalid_structure(tmp_path, content):
+    (tmp_path / MANIFEST_FILENAME).write_text(content, encoding='utf-8')
+
+    with pytest.raises(ValueError):
+        load_manifest(str(tmp_path))
+
+
+def test_build_manifest_reuses_download_checksums(tmp_path):
+    root = str(tmp_path)
+    write(root, 'images/baixada.jpg', JPEG)
+    write(root, 'descriptions/ferrugem.txt', b'descricao')
+    downloaded = dict(asset('images/baixada.jpg', url='https://exemplo/baixada.jpg'),
+                      size=len(JPEG), sha256=hashlib.sha256(JPEG).hexdigest())
+
+    with mock.patch('utils.manifest.hash_file', wraps=hash_file) as hashed:
+        manifest = build_manifest(root, [downloaded, asset('descriptions/ferrugem.txt', kind='description')])
+
+    hashed.assert_called_once_with(os.path.join(root, 'descriptions', 'ferrugem.txt'))
+    entries = {entry['path']: entry for entry in manifest['assets']}
+    assert entries['images/baixada.jpg']['sha256'] == downloaded['sha256']
+    assert entries['descriptions/ferrugem.txt']['size'] == len(b'descricao')
+
+
+def fake_download(content):
+    """Substitui download_file gravando o conteúdo informado no destino"""
+    def download(url, filepath, headers=None):
+        with open(filepath, 'wb') as f:
+            f.write(content)
+        return len(content), hashlib.sha256(content).hexdigest()
+    return download
+
+
+@pytest.mark.parametrize('served, accepted', [
+    # Origem devolve o JPEG completo: o arquivo é substituído
+    (JPEG, False),
+    # Origem devolve os mesmos bytes (ex.: dados após o marcador de fim): problema aceito
+    (JPEG + b'\x01' * 4096, True),
+])
+def test_repair_suspect_file(tmp_path, served, accepted):
+    root = str(tmp_path)
+    stored = JPEG[:2048] if not accepted else served
+    write(root, 'images/suspeita.jpg', stored)
+    save_manifest(build_manifest(root, [asset('images/suspeita.jpg', url='https://exemplo/s.jpg')]), root)
+    report = verify_manifest(root)
+    assert len(report['suspect']) == 1
+
+    with mock.patch('utils.manifest.download_file', side_effect=fake_download(served)):
+        repaired, failed = repair_manifest(root, report, min_delay=0, max_delay=0)
+
+    assert (repaired, failed) == (['images/suspeita.jpg'], [])
+    entry, = load_manifest(root)['assets']
+    assert entry['format_accepted'] is accepted
+    report = verify_manifest(root)
+    assert [e['path'] for e in report['ok']] == ['images/suspeita.jpg']
+
+
+def test_update_manifest_keeps_other_scrapers_entries(tmp_path):
+    root = str(tmp_path)
+    write(root, 'images/site.jpg', JPEG)
+    write(root, 'images/antiga.jpg', JPEG)
+    write(root, 'images/research/artigo.jpg', JPEG)
+    write(root, 'pdfs/artigo.pdf', PDF)
+    site_dirs = ['images', 'descriptions']
+    research_dirs = ['images/research', 'descriptions/research', 'pdfs']
+
+    update_manifest(root, [asset('images/site.jpg'), asset('images/antiga.jpg')], site_dirs)
+    update_manifest(root, [asset('images/research/artigo.jpg'), asset('pdfs/artigo.pdf', kind='pdf')],
+                    research_dirs)
+    # Nova execução do scraper do site substitui apenas as entradas das suas pastas
+    update_manifest(root, [asset('images/site.jpg')], site_dirs)
+
+    paths = [entry['path'] for entry in load_manifest(root)['assets']]
+    assert paths == ['images/research/artigo.jpg', 'images/site.jpg', 'pdfs/artigo.pdf']
+    report = verify_manifest(root)
+    assert report['orphaned'] == ['images/antiga.jpg']
+    assert not report['missing'] and not report['corrupt']
+
+
+def test_repair_refetches_only_broken_files_and_saves_manifest(dataset):
+    report = verify_manifest(dataset)
+    served = JPEG + b'\x00'
+
+    with mock.patch('utils.manifest.download_file', side_effect=fake_download(served)) as download:
+        repaired, failed = repair_manifest(dataset, report, min_delay=0, max_delay=0)
+
+    fetched = sorted(call.args[0] for call in download.call_args_list)
+    assert fetched == ['https://exemplo/deleted.pdf', 'https://exemplo/never.jpg',
+                       'https://exemplo/truncated.jpg']
+    assert sorted(repaired) == ['images/never_downloaded.jpg', 'images/truncated.jpg', 'pdfs/deleted.pdf']
+    assert failed == []
+
+    entries = {entry['path']: entry for entry in load_manifest(dataset)['assets']}
+    for rel_path in repaired:
+        assert entries[rel_path]['size'] == len(served)
+        assert entries[rel_path]['sha256'] == hashlib.sha256(served).hexdigest()
+    report = verify_manifest(dataset)
+    assert not report['missing'] and not report['corrupt']
+
+
+def test_repair_without_source_url_fails_and_keeps_manifest(dataset):
+    os.remove(os.path.join(dataset, 'descriptions', 'ferrugem.txt'))
+    report = verify_manifest(dataset)
+    report = dict(report, missing=[e for e in report['missing'] if e['kind'] == 'description'], corrupt=[])
+    with open(os.path.join(dataset, MANIFEST_FILENAME), 'rb') as f:
+        saved = f.read()
+
+    with mock.patch('utils.manifest.download_file') as download:
+        repaired, failed = repair_manifest(dataset, report, min_delay=0, max_delay=0)
+
+    download.assert_not_called()
+    assert (repaired, failed) == ([], ['descriptions/ferrugem.txt'])
+    with open(os.path.join(dataset, MANIFEST_FILENAME), 'rb') as f:
+        assert f.read() == saved
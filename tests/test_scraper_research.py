@@ -0,0 +1,66 @@
+# tests/test_scraper_research.py
+import os
+import hashlib
+from unittest import mock
+
+import pytest
+import requests
+
+from scrapers.scraper_research import PlantDiseaseScraper
+from utils.manifest import hash_file, load_manifest, verify_manifest
+
+PAGE = """
+<div class="disease-description">Pústulas alaranjadas nas folhas.</div>
+<div class="disease-images">
+  <img src="/img/ferrugem1.jpg">
+  <img src="/img/ferrugem2.jpg">
+</div>
+"""
+
+JPEG = b'\xff\xd8' + b'\x00' * 1024 + b'\xff\xd9'
+
+
+def fake_download(url, filepath, headers=None):
+    if url.endswith('ferrugem2.jpg'):
+        raise requests.exceptions.ConnectionError("conexão interrompida")
+    with open(filepath, 'wb') as f:
+        f.write(JPEG)
+    return len(JPEG), hashlib.sha256(JPEG).hexdigest()
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    scraper = PlantDiseaseScraper("https://exemplo", str(tmp_path))
+    with mock.patch.object(scraper, 'get_page', return_value=PAGE), \
+            mock.patch('scrapers.scraper_research.download_file', side_effect=fake_download), \
+            mock.patch('scrapers.scraper_research.time.sleep'):
+        scraper.parse_disease_page("https://exemplo/ferrugem", "Ferrugem")
+    return scraper
+
+
+def test_failed_download_is_tied_to_its_record(scraper):
+    failed, = scraper.failed_downloads
+
+    assert failed['kind'] == 'image'
+    assert failed['url'] == "https://exemplo/img/ferrugem2.jpg"
+    assert failed['record'] == "Ferrugem"
+    assert failed['record_url'] == "https://exemplo/ferrugem"
+    assert scraper.metadata[0]['image_count'] == 1
+
+
+def test_save_manifest_records_failed_download_as_missing(scraper):
+    with mock.patch('utils.manifest.hash_file', wraps=hash_file) as hashed:
+        scraper.save_manifest()
+
+    entries = {entry['url']: entry for entry in load_manifest(scraper.output_dir)['assets']}
+    downloaded = entries["https://exemplo/img/ferrugem1.jpg"]
+    failed = entries["https://exemplo/img/ferrugem2.jpg"]
+    assert downloaded['sha256'] == hashlib.sha256(JPEG).hexdigest()
+    assert (failed['size'], failed['sha256'], failed['record']) == (None, None, "Ferrugem")
+    # A imagem baixada já tem checksum do download e não é lida de novo para o hash
+    hashed_files = [os.path.basename(call.args[0]) for call in hashed.call_args_list]
+    assert downloaded['path'].split('/')[-1] not in hashed_files
+    assert scraper.metadata[0]['description_file'] in hashed_files
+
+    report = verify_manifest(scraper.output_dir)
+    assert [entry['path'] for entry in report['missing']] == [failed['path']]
@@ -0,0 +1,59 @@
+# utils/helpers.py
+import os
+import hashlib
+import requests
+
+# Tamanho dos blocos usados para baixar e ler arquivos (1 MiB)
+CHUNK_SIZE = 1024 * 1024
+
+
+def download_file(url, filepath, headers=None, timeout=30):
+    """
+    Baixa um arquivo de forma atômica
+
+    O conteúdo é gravado em um arquivo temporário ``.part`` e só é movido
+    para o destino final depois que o download termina e o tamanho bate com
+    o Content-Length informado pelo servidor. Assim, um download interrompido
+    nunca deixa um .jpg/.pdf truncado com aparência de arquivo válido.
+
+    Args:
+        url (str): URL do arquivo
+        filepath (str): Caminho final onde o arquivo será salvo
+        headers (dict): Headers HTTP da requisição
+        timeout (int): Timeout da requisição em segundos
+
+    Returns:
+        tuple: (tamanho em bytes, sha256 em hexadecimal) do arquivo salvo
+
+    Raises:
+        requests.exceptions.RequestException: Se a requisição falhar
+        IOError: Se o download vier incompleto
+    """
+    part_path = filepath + ".part"
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        with requests.get(url, headers=headers, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            expected = response.headers.get('Content-Length')
+            # Com compressão de transporte o Content-Length não corresponde ao corpo decodificado
+            if response.headers.get('Content-Encoding'):
+                expected = None
+
+            with open(part_path, 'wb') as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+
+        if expected is not None and expected.isdigit() and int(expected) != size:
+            raise IOError(f"download incompleto ({size} de {expected} bytes)")
+
+        os.replace(part_path, filepath)
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+
+    return size, digest.hexdigest()
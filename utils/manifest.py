@@ -0,0 +1,399 @@
+# utils/manifest.py
+import os
+import json
+import time
+import random
+import hashlib
+import posixpath
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from utils.helpers import CHUNK_SIZE, download_file
+
+# Nome do arquivo de manifesto salvo na raiz do dataset
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Quantidade de bytes do final do arquivo inspecionada na checagem de formato
+TAIL_SIZE = 1024
+
+
+def hash_file(path):
+    """
+    Calcula o tamanho e o sha256 de um arquivo
+
+    A leitura é feita em blocos grandes para um buffer reaproveitado; o hashlib
+    libera o GIL enquanto processa cada bloco, então várias threads conseguem
+    ler e calcular hashes em paralelo no ritmo do disco.
+    """
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):
+            digest = hashlib.file_digest(f, 'sha256')
+        else:
+            digest = hashlib.sha256()
+            buffer = bytearray(CHUNK_SIZE)
+            view = memoryview(buffer)
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                digest.update(view[:n])
+        size = f.tell()
+    return size, digest.hexdigest()
+
+
+def check_format(path):
+    """
+    Verifica se o arquivo parece completo a partir dos marcadores do formato
+
+    O formato é detectado pelo conteúdo (os scrapers salvam PNG/WebP com
+    extensão .jpg). Formatos desconhecidos não são checados.
+
+    Returns:
+        str: Descrição do problema, ou None se o arquivo parecer íntegro
+    """
+    with open(path, 'rb') as f:
+        head = f.read(8)
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - TAIL_SIZE))
+        tail = f.read()
+
+    if size == 0:
+        return "arquivo vazio"
+    if head.startswith(b'\xff\xd8'):
+        if b'\xff\xd9' not in tail:
+            return "JPEG sem marcador de fim (provavelmente truncado)"
+    elif head.startswith(b'\x89PNG'):
+        if b'IEND' not in tail:
+            return "PNG sem bloco IEND (provavelmente truncado)"
+    elif head.startswith(b'%PDF'):
+        if b'%%EOF' not in tail:
+            return "PDF sem marcador %%EOF (provavelmente truncado)"
+    return None
+
+
+def _scan_file(path):
+    """Lê um arquivo e devolve (tamanho, sha256, problema de formato)"""
+    size, sha256 = hash_file(path)
+    return size, sha256, check_format(path)
+
+
+def _check_asset(task):
+    """
+    Verifica um item do manifesto (executado no pool de threads/processos)
+
+    O formato só é checado na criação do manifesto: se o checksum confere, o
+    conteúdo é o mesmo de então e o problema registrado (ex.: arquivo truncado
+    antes do manifesto) marca o arquivo como suspeito. Um problema aceito no
+    reparo (origem devolve os mesmos bytes) não é reportado de novo.
+
+    Returns:
+        tuple: (caminho relativo, status, detalhe) com status 'ok', 'missing',
+            'corrupt' ou 'suspect'
+    """
+    root, entry = task
+    rel_path = entry['path']
+    path = os.path.join(root, *rel_path.split('/'))
+
+    try:
+        size = os.stat(path).st_size
+    except FileNotFoundError:
+        return rel_path, 'missing', None
+    except OSError as e:
+        return rel_path, 'corrupt', f"erro de acesso: {e}"
+
+    # Arquivo ausente na criação do manifesto que apareceu depois sem ser reparado
+    if entry['size'] is None:
+        return rel_path, 'corrupt', "sem checksum registrado no manifesto"
+
+    # Tamanho diferente já basta para marcar o arquivo, sem precisar lê-lo
+    if size != entry['size']:
+        return rel_path, 'corrupt', f"tamanho {size} bytes, esperado {entry['size']}"
+
+    try:
+        _, sha256 = hash_file(path)
+    except OSError as e:
+        return rel_path, 'corrupt', f"erro de leitura: {e}"
+
+    if sha256 != entry['sha256']:
+        return rel_path, 'corrupt', "checksum não confere"
+    if entry.get('format_problem') and not entry.get('format_accepted'):
+        return rel_path, 'suspect', entry['format_problem']
+    return rel_path, 'ok', None
+
+
+def _build_entry(task):
+    """Lê um arquivo do dataset para montar sua entrada no manifesto"""
+    root, asset = task
+    rel_path = asset['path']
+    path = os.path.join(root, *rel_path.split('/'))
+    try:
+        if asset.get('sha256') is not None:
+            # Tamanho e checksum já calculados durante o download; só o formato é lido
+            return rel_path, (asset['size'], asset['sha256'], check_format(path))
+        return rel_path, _scan_file(path)
+    except OSError:
+        return rel_path, None
+
+
+def _executor(workers, use_processes):
+    """Cria o pool usado para ler os arquivos"""
+    if use_processes:
+        return ProcessPoolExecutor(max_workers=workers)
+    # A leitura é limitada por I/O; mais threads que núcleos mantém o disco ocupado
+    return ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) * 4))
+
+
+def _chunksize(count, workers, use_processes):
+    """Agrupa tarefas ao usar processos para reduzir o custo de serialização"""
+    if not use_processes:
+        return 1
+    return max(1, count // ((workers or os.cpu_count() or 1) * 4))
+
+
+def build_manifest(output_dir, assets, workers=None, use_processes=False):
+    """
+    Monta o manifesto de integridade do dataset
+
+    Args:
+        output_dir (str): Diretório raiz do dataset
+        assets (list): Dicionários com 'path' (relativo a output_dir), 'kind',
+            'record', 'record_url' e 'url' (origem do arquivo, ou None).
+            Arquivos que não existem (ex.: downloads que falharam) entram com
+            tamanho e checksum None e são reportados como ausentes na verificação.
+            Se 'size' e 'sha256' já vierem preenchidos (calculados no download),
+            o arquivo não é lido novamente para gerar o hash
+        workers (int): Número de threads/processos usados na leitura
+        use_processes (bool): Usar um pool de processos em vez de threads
+
+    Returns:
+        dict: Manifesto com tamanho e sha256 de cada arquivo
+    """
+    unique = {}
+    for asset in assets:
+        unique.setdefault(asset['path'], asset)
+
+    entries = []
+    tasks = [(output_dir, asset) for asset in unique.values()]
+    with _executor(workers, use_processes) as executor:
+        results = executor.map(_build_entry, tasks,
+                               chunksize=_chunksize(len(tasks), workers, use_processes))
+        for rel_path, scanned in results:
+            if scanned is None:
+                print(f"Aviso: {rel_path} não encontrado, registrado como ausente")
+                size, sha256, problem = None, None, None
+            else:
+                size, sha256, problem = scanned
+            if problem:
+                print(f"Aviso: {rel_path}: {problem}")
+            entry = dict(unique[rel_path])
+            entry['size'] = size
+            entry['sha256'] = sha256
+            entry['format_problem'] = problem
+            entries.append(entry)
+
+    entries.sort(key=lambda e: e['path'])
+    return {
+        'version': MANIFEST_VERSION,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'algorithm': 'sha256',
+        'assets': entries,
+    }
+
+
+def save_manifest(manifest, output_dir):
+    """Salva o manifesto em JSON na raiz do dataset"""
+    manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+    return manifest_path
+
+
+def load_manifest(output_dir):
+    """Carrega o manifesto salvo na raiz do dataset"""
+    manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    if not isinstance(manifest, dict):
+        raise ValueError("estrutura inválida, esperado um objeto JSON")
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError(f"Versão de manifesto não suportada: {manifest.get('version')}")
+    if not isinstance(manifest.get('assets'), list):
+        raise ValueError("campo 'assets' ausente ou não é uma lista")
+    for i, entry in enumerate(manifest['assets']):
+        if not isinstance(entry, dict) or not {'path', 'size', 'sha256'} <= entry.keys():
+            raise ValueError(f"entrada {i} sem os campos 'path', 'size' e 'sha256'")
+    return manifest
+
+
+def update_manifest(output_dir, assets, owned_dirs, workers=None, use_processes=False):
+    """
+    Atualiza o manifesto do dataset com os arquivos de um scraper
+
+    Vários scrapers compartilham o mesmo dataset; cada um substitui apenas as
+    entradas das pastas que lhe pertencem e mantém as dos demais.
+
+    Args:
+        output_dir (str): Diretório raiz do dataset
+        assets (list): Arquivos do scraper, no formato de build_manifest
+        owned_dirs (list): Pastas (relativas a output_dir) cujos arquivos são
+            gerados pelo scraper, ex.: ['images', 'descriptions']
+
+    Returns:
+        str: Caminho do manifesto salvo
+    """
+    manifest = build_manifest(output_dir, assets, workers=workers, use_processes=use_processes)
+
+    try:
+        existing = load_manifest(output_dir)
+    except FileNotFoundError:
+        existing = None
+    except ValueError as e:
+        print(f"Aviso: manifesto existente ignorado ({e})")
+        existing = None
+
+    if existing:
+        owned_dirs = set(owned_dirs)
+        new_paths = {entry['path'] for entry in manifest['assets']}
+        kept = [entry for entry in existing['assets']
+                if posixpath.dirname(entry['path']) not in owned_dirs
+                and entry['path'] not in new_paths]
+        manifest['assets'] = sorted(kept + manifest['assets'], key=lambda e: e['path'])
+
+    return save_manifest(manifest, output_dir)
+
+
+def find_orphans(output_dir, known_paths):
+    """
+    Lista arquivos nas subpastas do dataset que não constam no manifesto
+
+    Arquivos na raiz (metadata.csv, manifest.json) são ignorados.
+    """
+    orphans = []
+    for dirpath, dirnames, filenames in os.walk(output_dir):
+        if dirpath == output_dir:
+            continue
+        for filename in filenames:
+            rel_path = os.path.relpath(os.path.join(dirpath, filename), output_dir)
+            rel_path = rel_path.replace(os.sep, '/')
+            if rel_path not in known_paths:
+                orphans.append(rel_path)
+    orphans.sort()
+    return orphans
+
+
+def verify_manifest(output_dir, manifest=None, workers=None, use_processes=False):
+    """
+    Confere os arquivos do dataset contra o manifesto
+
+    Args:
+        output_dir (str): Diretório raiz do dataset
+        manifest (dict): Manifesto a conferir (carregado do disco se omitido)
+        workers (int): Número de threads/processos usados na leitura
+        use_processes (bool): Usar um pool de processos em vez de threads
+
+    Returns:
+        dict: Relatório com as listas 'ok', 'missing', 'corrupt', 'suspect'
+            (checksum confere, mas o formato parecia incompleto na criação do
+            manifesto) e 'orphaned'
+    """
+    if manifest is None:
+        manifest = load_manifest(output_dir)
+
+    entries = {entry['path']: entry for entry in manifest['assets']}
+    report = {'ok': [], 'missing': [], 'corrupt': [], 'suspect': [], 'orphaned': []}
+
+    tasks = [(output_dir, entry) for entry in entries.values()]
+    with _executor(workers, use_processes) as executor:
+        results = executor.map(_check_asset, tasks,
+                               chunksize=_chunksize(len(tasks), workers, use_processes))
+        # A varredura de órfãos roda enquanto o pool lê os arquivos
+        report['orphaned'] = find_orphans(output_dir, entries)
+        for rel_path, status, detail in results:
+            entry = entries[rel_path]
+            if status in ('corrupt', 'suspect'):
+                report[status].append((entry, detail))
+            else:
+                report[status].append(entry)
+
+    return report
+
+
+def print_report(report):
+    """Exibe o resultado da verificação"""
+    print(f"Arquivos íntegros: {len(report['ok'])}")
+
+    print(f"Arquivos ausentes: {len(report['missing'])}")
+    for entry in report['missing']:
+        print(f"  ✗ {entry['path']} ({entry['record']})")
+
+    print(f"Arquivos corrompidos: {len(report['corrupt'])}")
+    for entry, detail in report['corrupt']:
+        print(f"  ✗ {entry['path']} ({entry['record']}): {detail}")
+
+    print(f"Arquivos suspeitos: {len(report['suspect'])}")
+    for entry, detail in report['suspect']:
+        print(f"  ! {entry['path']} ({entry['record']}): {detail}")
+
+    print(f"Arquivos órfãos: {len(report['orphaned'])}")
+    for rel_path in report['orphaned']:
+        print(f"  ? {rel_path}")
+
+
+def repair_manifest(output_dir, report, manifest=None, headers=None,
+                    min_delay=1.0, max_delay=3.0):
+    """
+    Baixa novamente apenas os arquivos ausentes, corrompidos ou suspeitos
+
+    Só é possível reparar arquivos com URL de origem no manifesto; descrições
+    são geradas localmente e exigem executar o scraper novamente. As entradas
+    reparadas recebem o novo tamanho e checksum e o manifesto é salvo. Se a
+    origem devolver exatamente os mesmos bytes de um arquivo suspeito, o
+    problema de formato é do próprio arquivo e passa a ser aceito.
+
+    Returns:
+        tuple: (lista de caminhos reparados, lista de caminhos não reparados)
+    """
+    if manifest is None:
+        manifest = load_manifest(output_dir)
+
+    entries = {entry['path']: entry for entry in manifest['assets']}
+    broken = [entry['path'] for entry in report['missing']]
+    broken += [entry['path'] for entry, _ in report['corrupt']]
+    broken += [entry['path'] for entry, _ in report.get('suspect', [])]
+
+    repaired = []
+    failed = []
+    for i, rel_path in enumerate(broken):
+        entry = entries[rel_path]
+        if not entry.get('url'):
+            print(f"[{i+1}/{len(broken)}] Sem URL de origem, não é possível reparar: {rel_path}")
+            failed.append(rel_path)
+            continue
+
+        print(f"[{i+1}/{len(broken)}] Baixando novamente: {rel_path}")
+        path = os.path.join(output_dir, *rel_path.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            previous_sha256 = entry['sha256']
+            entry['size'], entry['sha256'] = download_file(entry['url'], path, headers=headers)
+            entry['format_problem'] = check_format(path)
+            entry['format_accepted'] = bool(entry['format_problem']) and entry['sha256'] == previous_sha256
+            if entry['format_accepted']:
+                print(f"  ! Origem devolveu o mesmo conteúdo; problema de formato aceito: {entry['format_problem']}")
+            repaired.append(rel_path)
+        except Exception as e:
+            print(f"  ✗ Erro ao baixar {entry['url']}: {e}")
+            failed.append(rel_path)
+
+        # Pausa entre requisições para evitar bloqueios
+        if i + 1 < len(broken):
+            time.sleep(random.uniform(min_delay, max_delay))
+
+    if repaired:
+        save_manifest(manifest, output_dir)
+
+    return repaired, failed